@@ -1,8 +1,10 @@
 import os
+import re
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
 import pandas as pd
 from pprint import pprint
+from tqdm import tqdm
 from sqlalchemy.exc import ProgrammingError as SQLAlchemyProgrammingError, OperationalError as SQLAlchemyOperationalError
 from pymysql.err import ProgrammingError as PyMySQLProgrammingError, OperationalError as PyMySQLOperationalError
 
@@ -12,7 +14,8 @@ class DBData:
     Inicia conn com DB. Depende de config do '.env'.\n
     ## Métodos:\n
     * **query_data:** Abre uma conexão com o DB MySQL usando as configs do `.env`, consulta e exporta os dados.\n
-    * **editions:** Retorna as edições disponiveis em `eventcomplement.globalEvent`.
+    * **editions:** Retorna as edições disponiveis em `eventcomplement.globalEvent`.\n
+    * **load_addresses:** Faz upsert em lotes dos endereços obtidos nas APIs numa tabela de staging.
     '''
     
     def __init__(
@@ -36,97 +39,128 @@ class DBData:
             data_compra_ini:str='1900-01-01',
             data_compra_fini:str='2100-12-31',
             limit_max_rows:int=10000000,
-            total_rows_in_batches:int=10000000
+            total_rows_in_batches:int=10000000,
+            shared_scan:bool=False
             ):
         '''
         Abre uma conexão com o DB MySQL usando as configs do `.env`.\n
         Consulta o DB com a query em `select_ceps.sql`.\n
         A query recebe os args do método.\n
+        Com `shared_scan`, os participantes elegíveis são resolvidos uma única vez na tabela temporária `participants_scan`
+        (`create_participants_scan.sql`) e forms e participants são consultados a partir dela.\n
         ## Args \n
         * **total_rows_in_batches (int, optional):** Nº de registros nos batches pra separar o dataset.\n
         * **edicao (str, optional):** Edição do evento, `eventcomplement.globalEvent`.\n
         * **data_compra_ini (str, optional):** Data de compra inicial.\n
         * **data_compra_fini (str, optional):** Data de compra final.\n
         * **limit_max_rows (int, optional):** Limite de linhas.\n
+        * **shared_scan (bool, optional):** Resolve os participantes uma única vez para ambas as queries. Default -> False.\n
         ## Retorno:\n
         * **DataFrame:** DataFrame com os dados da query.**
         '''
 
-        self.connection = create_engine(self.endpoint).connect()
+        self.engine = create_engine(self.endpoint)
+        self.connection = self.engine.connect()
         self.total_rows_in_batches = total_rows_in_batches
         self.edicao = edicao
         self.data_compra_ini = data_compra_ini
         self.data_compra_fini = data_compra_fini
         self.limit_max_rows = limit_max_rows
+        self.shared_scan = shared_scan
         
         try:
             with self.connection as conn:
-                
-                # paths das queries
-                forms_ceps_txt_path = os.path.join(os.getcwd(), 'src', 'queries', 'select_ceps.sql')
-                participants_txt_path = os.path.join(os.getcwd(), 'src', 'queries', 'select_participants.sql')
-                
-                
-                # select e export dos forms
-                print('\nconsulting ceps...')
-                with open(forms_ceps_txt_path, "r", encoding='utf-8') as f:
-                    mappings_forms = {
-                        'total_rows_in_batches': self.total_rows_in_batches,
-                        'edicao': self.edicao,
-                        'data_compra_ini': self.data_compra_ini,
-                        'data_compra_fini': self.data_compra_fini,
-                        'limit_max_rows': self.limit_max_rows
-                        }
-                
-                    query = f.read().format_map(mappings_forms)
-                    forms_df = pd.read_sql(query, conn)
-                    forms_df.to_excel(
-                        os.path.join(
-                            os.getcwd(),
-                            'src','datasets','forms',
-                            f'forms_results_{self.edicao}.xlsx'.replace(' ', '_')
-                            ),
-                        index=False, engine='openpyxl'
-                    )
+                try:
+                    # paths das queries
+                    forms_ceps_txt_path = os.path.join(os.getcwd(), 'src', 'queries', 'select_ceps.sql')
+                    participants_txt_path = os.path.join(os.getcwd(), 'src', 'queries', 'select_participants.sql')
                     
-                    if len(forms_df) == 0:
-                        print(f'Nenhum cep encontrado. Checar args e query. Mappings:')
-                        pprint(mappings_forms)
-                        return 
                     
-                    print(f'Total de registros carregados e exportados: {len(forms_df)} ceps.')
-                
-
-                # select e export dos participants
-                print('\nconsulting participants...')
-                with open(participants_txt_path, "r", encoding='utf-8') as f:
-                    mappings_participants = {
-                        'total_rows_in_batches': self.total_rows_in_batches,
-                        'edicao': self.edicao,
-                        'data_compra_ini': self.data_compra_ini,
-                        'data_compra_fini': self.data_compra_fini,
-                        'limit_max_rows': self.limit_max_rows
-                        }
-
-                    query = f.read().format_map(mappings_participants)
-                    participants_df = pd.read_sql(query, conn)
-                    participants_df.to_excel(
-                        os.path.join(
-                            os.getcwd(),
-                            'src','datasets','participants',
-                            f'participants_results_{self.edicao}.xlsx'.replace(' ', '_')
-                            ),
-                        index=False, engine='openpyxl'
-                    )
+                    # scan único dos participantes elegíveis, compartilhado por forms e participants
+                    if self.shared_scan:
+                        forms_ceps_txt_path = os.path.join(os.getcwd(), 'src', 'queries', 'select_ceps_shared.sql')
+                        participants_txt_path = os.path.join(os.getcwd(), 'src', 'queries', 'select_participants_shared.sql')
+                        drop_scan_txt_path = os.path.join(os.getcwd(), 'src', 'queries', 'drop_participants_scan.sql')
+                        scan_txt_path = os.path.join(os.getcwd(), 'src', 'queries', 'create_participants_scan.sql')
+                        
+                        print('\nscanning participants...')
+                        with open(scan_txt_path, "r", encoding='utf-8') as f:
+                            mappings_scan = {
+                                'edicao': self.edicao,
+                                'data_compra_ini': self.data_compra_ini,
+                                'data_compra_fini': self.data_compra_fini
+                                }
+                            
+                            query = f.read().format_map(mappings_scan)
+                            conn.exec_driver_sql(query)
                     
-                    if len(participants_df) == 0:
-                        print(f'Nenhum participante encontrado. Checar args e query. Mappings:')
-                        pprint(mappings_participants)
-                        return 
                     
-                    print(f'Total de registros carregados e exportados: {len(participants_df)} participants.')
-                    return participants_df
-                
+                    # select e export dos forms
+                    print('\nconsulting ceps...')
+                    with open(forms_ceps_txt_path, "r", encoding='utf-8') as f:
+                        mappings_forms = {
+                            'total_rows_in_batches': self.total_rows_in_batches,
+                            'edicao': self.edicao,
+                            'data_compra_ini': self.data_compra_ini,
+                            'data_compra_fini': self.data_compra_fini,
+                            'limit_max_rows': self.limit_max_rows
+                            }
+                    
+                        query = f.read().format_map(mappings_forms)
+                        forms_df = pd.read_sql(query, conn)
+                        forms_df.to_excel(
+                            os.path.join(
+                                os.getcwd(),
+                                'src','datasets','forms',
+                                f'forms_results_{self.edicao}.xlsx'.replace(' ', '_')
+                                ),
+                            index=False, engine='openpyxl'
+                        )
+                        
+                        if len(forms_df) == 0:
+                            print(f'Nenhum cep encontrado. Checar args e query. Mappings:')
+                            pprint(mappings_forms)
+                            return 
+                        
+                        print(f'Total de registros carregados e exportados: {len(forms_df)} ceps.')
+                    
+
+                    # select e export dos participants
+                    print('\nconsulting participants...')
+                    with open(participants_txt_path, "r", encoding='utf-8') as f:
+                        mappings_participants = {
+                            'total_rows_in_batches': self.total_rows_in_batches,
+                            'edicao': self.edicao,
+                            'data_compra_ini': self.data_compra_ini,
+                            'data_compra_fini': self.data_compra_fini,
+                            'limit_max_rows': self.limit_max_rows
+                            }
+
+                        query = f.read().format_map(mappings_participants)
+                        participants_df = pd.read_sql(query, conn)
+                        participants_df.to_excel(
+                            os.path.join(
+                                os.getcwd(),
+                                'src','datasets','participants',
+                                f'participants_results_{self.edicao}.xlsx'.replace(' ', '_')
+                                ),
+                            index=False, engine='openpyxl'
+                        )
+                        
+                        if len(participants_df) == 0:
+                            print(f'Nenhum participante encontrado. Checar args e query. Mappings:')
+                            pprint(mappings_participants)
+                            return 
+                        
+                        print(f'Total de registros carregados e exportados: {len(participants_df)} participants.')
+                        return participants_df
+
+                finally:
+                    # libera a tabela temporária também nos returns antecipados
+                    if self.shared_scan:
+                        with open(drop_scan_txt_path, "r", encoding='utf-8') as f:
+                            conn.exec_driver_sql(f.read())
+
 
         except (SQLAlchemyProgrammingError, PyMySQLProgrammingError) as err:
             return print(f'Erro de conn/objs do DB inexistentes: \n args: {err.args} \n SQLALCHEMY_CODE_ERROR: {err.code}')
@@ -134,6 +168,8 @@ class DBData:
             return print(f'Erro de sintaxe de query: \n args: {err.args} \n SQLALCHEMY_CODE_ERROR: {err.code}')
         except Exception as err:
             return print(f'Erro geral: \n args: {err.args}')
+        finally:
+            self.engine.dispose()
         
         
     def editions(self, like_param:str=None):
@@ -178,6 +214,78 @@ class DBData:
             return print(f'Erro geral: \n args: {err.args}')
 
 
+    def load_addresses(
+            self,
+            addresses_df:pd.DataFrame,
+            staging_table:str='addresses_staging',
+            chunksize:int=10000
+            ):
+        '''
+        Faz upsert dos endereços retornados por `CallsClass.triforce` (`complete_api_df`) numa tabela de staging.\n
+        Cria a tabela com `create_addresses_staging.sql` caso não exista e grava com `upsert_addresses.sql`.\n
+        Os registros vão em lotes de `chunksize` via `executemany` (insert multi-linhas), com commit a cada lote.
+        Como `item_id` é a chave, recarregar o mesmo df (ou retomar uma carga interrompida) não duplica registros.\n
+        ## Args \n
+        * **addresses_df (DataFrame):** DataFrame com as cols `item_id`, `cep`, `state`, `city`, `neighborhood`, `street` e `service`.\n
+        * **staging_table (str, optional):** Nome da tabela de staging, só letras, números e `_`. Default -> `addresses_staging`.\n
+        * **chunksize (int, optional):** Nº de registros por lote. Default -> 10000.\n
+        ## Retorno:\n
+        * **int:** Nº de registros enviados ao DB.
+        '''
+
+        self.staging_table = staging_table
+        self.chunksize = int(chunksize)
+        engine = None
+
+        try:
+            if not re.fullmatch(r'[A-Za-z0-9_]+', str(self.staging_table)):
+                raise ValueError(f'Nome de tabela inválido: {self.staging_table!r}')
+
+            columns = ['item_id', 'cep', 'state', 'city', 'neighborhood', 'street', 'service']
+            addresses = (
+                addresses_df[columns]
+                .dropna(subset=['item_id'])
+                .drop_duplicates(subset=['item_id'], keep='last')
+                .astype(object)
+            )
+            addresses = addresses.where(addresses.notna(), None)
+            addresses['item_id'] = addresses['item_id'].astype(int)
+            rows = list(addresses.itertuples(index=False, name=None))
+
+            self.engine = engine = create_engine(self.endpoint)
+            self.connection = self.engine.connect()
+            with self.connection as conn:
+                create_txt_path = os.path.join(os.getcwd(), 'src', 'queries', 'create_addresses_staging.sql')
+                upsert_txt_path = os.path.join(os.getcwd(), 'src', 'queries', 'upsert_addresses.sql')
+                mappings = {
+                    'staging_table': self.staging_table
+                    }
+
+                with open(create_txt_path, "r", encoding='utf-8') as f:
+                    conn.exec_driver_sql(f.read().format_map(mappings))
+
+                with open(upsert_txt_path, "r", encoding='utf-8') as f:
+                    upsert = f.read().format_map(mappings)
+
+                print(f'\nloading addresses into {self.staging_table}...')
+                for start in tqdm(range(0, len(rows), self.chunksize)):
+                    conn.exec_driver_sql(upsert, rows[start:start + self.chunksize])
+                    conn.commit()
+
+                print(f'Total de registros carregados: {len(rows)} endereços.')
+                return len(rows)
+
+        except (SQLAlchemyProgrammingError, PyMySQLProgrammingError) as err:
+            return print(f'Erro de conn/objs do DB inexistentes: \n args: {err.args} \n SQLALCHEMY_CODE_ERROR: {err.code}')
+        except (SQLAlchemyOperationalError, PyMySQLOperationalError) as err:
+            return print(f'Erro de sintaxe de query: \n args: {err.args} \n SQLALCHEMY_CODE_ERROR: {err.code}')
+        except Exception as err:
+            return print(f'Erro geral: \n args: {err.args}')
+        finally:
+            if engine is not None:
+                engine.dispose()
+
+
     def ScrapDB(
             self,
             query_or_list_editions:int = 2,
@@ -185,7 +293,8 @@ class DBData:
             data_compra_ini:str = None,
             data_compra_fini:str = None,
             total_rows_in_batches:int = None,
-            limit_max_rows:int = None):
+            limit_max_rows:int = None,
+            shared_scan:bool = False):
         '''
         Duas opções:\n
         * **Consultar formulários e participantes:** exporta para excel ambos arquivos na pasta datasets.\n
@@ -197,6 +306,7 @@ class DBData:
         * **data_compra_fini (str, optional):** Data de compra final.\n
         * **total_rows_in_batches (int, optional):** Nº de registros nos batches pra separar o dataset.\n
         * **limit_max_rows (int, optional):** Limite de registros no dataset.\n
+        * **shared_scan (bool, optional):** Resolve os participantes uma única vez para forms e participants. Default -> False.\n
         '''
         self.query_or_list_editions = query_or_list_editions
         self.edicao = edicao or DBData.query_data.__defaults__[0]
@@ -204,6 +314,7 @@ class DBData:
         self.data_compra_fini = data_compra_fini or DBData.query_data.__defaults__[2]
         self.total_rows_in_batches = total_rows_in_batches or DBData.query_data.__defaults__[3]
         self.limit_max_rows = limit_max_rows or DBData.query_data.__defaults__[4]
+        self.shared_scan = shared_scan
 
         if int(self.query_or_list_editions) == 1:
             self.queried_data = self.query_data(
@@ -211,7 +322,8 @@ class DBData:
                 data_compra_ini =       DBData.query_data.__defaults__[1] if data_compra_ini == ''       else self.data_compra_ini, 
                 data_compra_fini =      DBData.query_data.__defaults__[2] if data_compra_fini == ''      else self.data_compra_fini, 
                 limit_max_rows =        DBData.query_data.__defaults__[3] if limit_max_rows == ''        else self.limit_max_rows, 
-                total_rows_in_batches = DBData.query_data.__defaults__[4] if total_rows_in_batches == '' else self.total_rows_in_batches
+                total_rows_in_batches = DBData.query_data.__defaults__[4] if total_rows_in_batches == '' else self.total_rows_in_batches,
+                shared_scan =           self.shared_scan
                 )
             print('Forms e participants carregados e exportados.')
             return
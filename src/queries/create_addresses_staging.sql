@@ -0,0 +1,12 @@
+create table if not exists `{staging_table}` (
+  `item_id` bigint not null
+, `cep` varchar(16)
+, `state` varchar(8)
+, `city` varchar(128)
+, `neighborhood` varchar(255)
+, `street` varchar(255)
+, `service` varchar(32)
+, `updatedAt` timestamp not null default current_timestamp on update current_timestamp
+, primary key (`item_id`)
+)
+;
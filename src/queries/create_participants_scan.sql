@@ -0,0 +1,36 @@
+create temporary table participants_scan (
+    index `idx_participant_id` (`participant_id`)
+)
+select
+  checkoutparticipant.`id` as `participant_id`
+, checkoutsession.`id` as `session_id`
+, event.`id` as `event_id`
+, eventcomplement.`globalEvent` as `edicao`
+, event.`title` as `evento`
+, eventticketcomplement.`nameParsed` as `prova`
+, eventticket.`name` as `ticket`
+, eventticketbatchpricetype.`name` as `tipo_ticket`
+, cast(date_add(checkoutparticipant.`createdAt`, interval -3 hour) as date) as `data_compra_participante`
+, cast(date_add(checkoutsession.`createdAt`, interval -3 hour) as date) as `data_compra_sessao`
+
+from checkoutparticipant
+    left join checkouteventticketbatchprice             on checkouteventticketbatchprice.`id` = checkoutparticipant.`checkoutEventTicketBatchPriceId`
+    left join eventticketbatchprice                     on eventticketbatchprice.`id` = checkouteventticketbatchprice.`eventTicketBatchPriceId`
+    left join eventticketbatchpricetype                 on eventticketbatchpricetype.`id` = eventticketbatchprice.`typeId`
+    left join eventticketbatch                          on eventticketbatch.`id` = eventticketbatchprice.`ticketBatchId`
+    left join eventticket                               on eventticket.`id` = eventticketbatch.`ticketId`
+    left join eventticketcomplement                     on eventticketcomplement.`ticketId` = eventticket.`id`
+    left join event                                     on event.`id` = eventticket.`eventId`
+    left join eventcomplement                           on eventcomplement.`eventId` = event.`id`
+    left join checkoutsession                           on checkoutsession.`id` = checkoutparticipant.`sessionId`
+    left join checkoutorderticketpartialcancel          on checkoutorderticketpartialcancel.`participantId` = checkoutparticipant.`id`
+
+where 1=1
+  and eventcomplement.`globalEvent` = '{edicao}'
+  and checkoutsession.`status` = 'Paid'
+  and checkoutorderticketpartialcancel.`reason` is null
+  and (
+       cast(date_add(checkoutparticipant.`createdAt`, interval -3 hour) as date) between '{data_compra_ini}' and '{data_compra_fini}'
+    or cast(date_add(checkoutsession.`createdAt`, interval -3 hour) as date) between '{data_compra_ini}' and '{data_compra_fini}'
+  )
+;
@@ -0,0 +1,2 @@
+drop temporary table if exists participants_scan
+;
@@ -0,0 +1,23 @@
+select 
+  floor((row_number() over (order by participants_scan.`participant_id`) - 1) / {total_rows_in_batches}) + 1 as `batch_number`
+, formfieldanswer.`checkoutParticipantId` as `participant_id`
+, participants_scan.`data_compra_participante` as `data_compra`
+, participants_scan.`edicao` as `edicao`
+, participants_scan.`evento` as `evento`
+, formfieldanswer.`fieldId` as `field_id`
+, formFieldsPlaceholderParsed.`placeholder` as `pergunta_cadastrada`
+, formFieldsPlaceholderParsed.`placeholderParsed` as `pergunta_tratada`
+, formfieldanswer.`answer` as `cep`
+
+from participants_scan
+    inner join formfieldanswer                          on formfieldanswer.`checkoutParticipantId` = participants_scan.`participant_id`
+    inner join formFieldsPlaceholderParsed              on formFieldsPlaceholderParsed.`fieldId` collate 'utf8mb4_0900_ai_ci' = formfieldanswer.`fieldId` collate 'utf8mb4_0900_ai_ci'
+
+where 1=1
+  and participants_scan.`data_compra_participante` between '{data_compra_ini}' and '{data_compra_fini}'
+  and formFieldsPlaceholderParsed.`placeholderParsed` = 'CEP'
+  and formfieldanswer.`answer` <> 'true'
+  and formfieldanswer.`answer` <> 'null'
+
+limit {limit_max_rows}
+;
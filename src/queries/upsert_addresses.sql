@@ -0,0 +1,9 @@
+insert into `{staging_table}` (`item_id`, `cep`, `state`, `city`, `neighborhood`, `street`, `service`)
+values (%s, %s, %s, %s, %s, %s, %s) as new
+on duplicate key update
+  `cep` = new.`cep`
+, `state` = new.`state`
+, `city` = new.`city`
+, `neighborhood` = new.`neighborhood`
+, `street` = new.`street`
+, `service` = new.`service`
@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from src.python.classes import DBData as DBData_module
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeConnection:
+    '''
+    Stand-in da conn do SQLAlchemy. Só registra, em ordem, as chamadas de `exec_driver_sql`, `read_sql` e `commit`.
+    '''
+
+    def __init__(self):
+        self.calls = []
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+        return False
+
+    def exec_driver_sql(self, statement, parameters=None):
+        self.calls.append(('exec', statement, parameters))
+
+    def commit(self):
+        self.calls.append(('commit', None, None))
+
+
+class FakeEngine:
+    def __init__(self, connections:list):
+        self.connections = connections
+        self.disposed = False
+
+    def connect(self):
+        conn = FakeConnection()
+        self.connections.append(conn)
+        return conn
+
+    def dispose(self):
+        self.disposed = True
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    '''
+    Troca o `create_engine` do `DBData` por um `FakeEngine`. Retorna as listas de conns e engines criadas.
+    '''
+    connections, engines = [], []
+
+    def fake_create_engine(endpoint):
+        engine = FakeEngine(connections)
+        engines.append(engine)
+        return engine
+
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(DBData_module, 'create_engine', fake_create_engine)
+    return connections, engines
@@ -0,0 +1,139 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from pymysql.cursors import RE_INSERT_VALUES
+from sqlalchemy import create_engine
+
+from src.python.classes.DBData import DBData
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# DB local (MySQL >= 8.0.19, por causa do alias de linha no upsert) para os testes de integração. Sem `TEST_DB_HOST` eles são pulados.
+TEST_DB = {
+    'host': os.getenv('TEST_DB_HOST'),
+    'user': os.getenv('TEST_DB_USER', 'root'),
+    'password': os.getenv('TEST_DB_PASSWORD', ''),
+    'database': os.getenv('TEST_DB_DATABASE', 'test'),
+    }
+TEST_TABLE = 'addresses_staging_test'
+
+
+def addresses(n:int) -> pd.DataFrame:
+    return pd.DataFrame({
+        'item_id': list(range(1, n + 1)),
+        'cep': [f'{i:08d}' for i in range(1, n + 1)],
+        'state': ['RJ'] * n,
+        'city': ['Rio de Janeiro'] * n,
+        'neighborhood': ['Centro'] * n,
+        'street': ['Rua A'] * n,
+        'service': ['viacep'] * n,
+        }, dtype='object')
+
+
+def sent_rows(conn) -> list:
+    return [row for kind, statement, params in conn.calls
+            if kind == 'exec' and statement.lstrip().lower().startswith('insert')
+            for row in params]
+
+
+def test_rows_sent_in_chunks_with_one_commit_per_chunk(fake_db):
+    connections, engines = fake_db
+
+    loaded = DBData().load_addresses(addresses(25), chunksize=10)
+
+    conn = connections[0]
+    assert loaded == 25
+    batches = [len(params) for kind, statement, params in conn.calls
+               if kind == 'exec' and statement.lstrip().lower().startswith('insert')]
+    assert batches == [10, 10, 5]
+    assert [kind for kind, _, _ in conn.calls] == ['exec', 'exec', 'commit', 'exec', 'commit', 'exec', 'commit']
+    assert conn.closed
+
+
+def test_upsert_is_batched_by_pymysql():
+    with open(os.path.join(ROOT, 'src', 'queries', 'upsert_addresses.sql'), 'r', encoding='utf-8') as f:
+        upsert = f.read().format_map({'staging_table': 'addresses_staging'})
+
+    assert RE_INSERT_VALUES.match(upsert)
+
+
+def test_duplicated_item_id_keeps_last(fake_db):
+    connections, engines = fake_db
+    df = pd.concat([addresses(2), addresses(2).assign(cep='11111111')], ignore_index=True)
+
+    loaded = DBData().load_addresses(df)
+
+    assert loaded == 2
+    sent = sent_rows(connections[0])
+    assert [row[0] for row in sent] == [1, 2]
+    assert all(row[1] == '11111111' for row in sent)
+
+
+def test_nan_becomes_none(fake_db):
+    connections, engines = fake_db
+    df = addresses(2)
+    df.loc[0, 'neighborhood'] = np.nan
+    df.loc[1, 'street'] = None
+
+    DBData().load_addresses(df)
+
+    first, second = sent_rows(connections[0])
+    assert first[4] is None
+    assert second[5] is None
+    assert isinstance(first[0], int)
+
+
+def test_bad_input_goes_through_error_path_without_opening_conn(fake_db, capsys):
+    connections, engines = fake_db
+
+    result = DBData().load_addresses(addresses(2).drop(columns=['service']))
+
+    assert result is None
+    assert 'Erro geral' in capsys.readouterr().out
+    assert connections == []
+
+
+@pytest.mark.parametrize('staging_table', ['addresses`; drop table x; --', 'addresses staging', ''])
+def test_invalid_table_name_is_rejected(fake_db, capsys, staging_table):
+    connections, engines = fake_db
+
+    result = DBData().load_addresses(addresses(2), staging_table=staging_table)
+
+    assert result is None
+    assert 'Nome de tabela inválido' in capsys.readouterr().out
+    assert connections == []
+
+
+@pytest.fixture
+def mysql_db(monkeypatch):
+    if not TEST_DB['host']:
+        pytest.skip('sem DB local: setar TEST_DB_HOST (e TEST_DB_USER, TEST_DB_PASSWORD, TEST_DB_DATABASE)')
+
+    monkeypatch.chdir(ROOT)
+    db = DBData(**TEST_DB)
+    engine = create_engine(db.endpoint)
+    with engine.connect() as conn:
+        conn.exec_driver_sql(f'drop table if exists `{TEST_TABLE}`')
+    yield db, engine
+    with engine.connect() as conn:
+        conn.exec_driver_sql(f'drop table if exists `{TEST_TABLE}`')
+    engine.dispose()
+
+
+def test_reload_upserts_instead_of_duplicating_on_mysql(mysql_db):
+    db, engine = mysql_db
+    df = addresses(5)
+
+    assert db.load_addresses(df, staging_table=TEST_TABLE, chunksize=2) == 5
+    df.loc[df['item_id'] == 3, 'cep'] = '99999999'
+    df.loc[df['item_id'] == 4, 'street'] = np.nan
+    assert db.load_addresses(df, staging_table=TEST_TABLE, chunksize=2) == 5
+
+    stored = pd.read_sql(f'select * from `{TEST_TABLE}` order by `item_id`', engine)
+    assert len(stored) == 5
+    assert stored['item_id'].tolist() == [1, 2, 3, 4, 5]
+    assert stored.loc[stored['item_id'] == 3, 'cep'].item() == '99999999'
+    assert stored.loc[stored['item_id'] == 4, 'street'].isna().item()
@@ -0,0 +1,103 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.python.classes.DBData import DBData
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MAPPINGS = {
+    'total_rows_in_batches': 2500,
+    'edicao': 'Corrida 10:00',
+    'data_compra_ini': '2024-01-01',
+    'data_compra_fini': '2024-12-31',
+    'limit_max_rows': 1000,
+    }
+
+
+@pytest.fixture
+def fake_read_sql(monkeypatch):
+    '''
+    `pd.read_sql` registra a query na fake conn e devolve `rows` linhas. `to_excel` não grava nada.
+    '''
+    rows = {'n': 1}
+
+    def read_sql(query, conn):
+        conn.calls.append(('read_sql', query, None))
+        return pd.DataFrame({'participant_id': list(range(rows['n']))})
+
+    monkeypatch.setattr(pd, 'read_sql', read_sql)
+    monkeypatch.setattr(pd.DataFrame, 'to_excel', lambda *args, **kwargs: None)
+    return rows
+
+
+def query_file(name:str) -> str:
+    with open(os.path.join(ROOT, 'src', 'queries', name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def run(shared_scan:bool):
+    return DBData().query_data(
+        edicao=MAPPINGS['edicao'],
+        data_compra_ini=MAPPINGS['data_compra_ini'],
+        data_compra_fini=MAPPINGS['data_compra_fini'],
+        limit_max_rows=MAPPINGS['limit_max_rows'],
+        total_rows_in_batches=MAPPINGS['total_rows_in_batches'],
+        shared_scan=shared_scan
+        )
+
+
+def test_shared_scan_runs_create_selects_and_drop_on_one_conn(fake_db, fake_read_sql):
+    connections, engines = fake_db
+
+    result = run(shared_scan=True)
+
+    assert isinstance(result, pd.DataFrame)
+    assert len(connections) == 1
+    statements = [(kind, statement.lstrip().lower()) for kind, statement, _ in connections[0].calls]
+    assert [kind for kind, _ in statements] == ['exec', 'read_sql', 'read_sql', 'exec']
+    assert statements[0][1].startswith('create temporary table participants_scan')
+    assert 'formfieldanswer' in statements[1][1] and 'from participants_scan' in statements[1][1]
+    assert 'checkoutpayment' in statements[2][1] and 'from participants_scan' in statements[2][1]
+    assert statements[3][1].startswith('drop temporary table if exists participants_scan')
+    assert engines[0].disposed
+
+
+def test_shared_scan_drops_table_on_early_return(fake_db, fake_read_sql):
+    connections, engines = fake_db
+    fake_read_sql['n'] = 0
+
+    assert run(shared_scan=True) is None
+
+    kinds = [kind for kind, _, _ in connections[0].calls]
+    assert kinds == ['exec', 'read_sql', 'exec']
+    assert connections[0].calls[-1][1].lstrip().lower().startswith('drop temporary table')
+    assert engines[0].disposed
+
+
+def test_shared_queries_are_filled_from_mappings(fake_db, fake_read_sql):
+    connections, engines = fake_db
+
+    run(shared_scan=True)
+
+    statements = [statement for _, statement, _ in connections[0].calls]
+    assert all('{' not in statement and '}' not in statement for statement in statements)
+    create, forms, participants, drop = statements
+    for statement in (create, forms, participants):
+        assert MAPPINGS['data_compra_ini'] in statement and MAPPINGS['data_compra_fini'] in statement
+    assert f"'{MAPPINGS['edicao']}'" in create
+    assert f"limit {MAPPINGS['limit_max_rows']}" in forms and f"limit {MAPPINGS['limit_max_rows']}" in participants
+
+
+def test_default_mode_sends_original_queries(fake_db, fake_read_sql):
+    connections, engines = fake_db
+
+    run(shared_scan=False)
+
+    assert connections[0].calls == [
+        ('read_sql', query_file('select_ceps.sql').format_map(MAPPINGS), None),
+        ('read_sql', query_file('select_participants.sql').format_map(MAPPINGS), None),
+        ]
+    assert engines[0].disposed